@@ -1,35 +1,128 @@
 """The Stokercloud integration."""
 
+from __future__ import annotations
+
 import asyncio
-from dataclasses import field
 from datetime import timedelta
 import logging
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 
-from homeassistant.components.number import NumberEntityDescription
-from homeassistant.components.sensor import SensorEntityDescription, dataclass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, ServiceCall, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.storage import Store
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
-from .const import DOMAIN
-from .stokercloud_api import Client as StokerCloudClient
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_END_DATE,
+    ATTR_ENTRY_ID,
+    ATTR_START_DATE,
+    BURST_DURATION,
+    BURST_INTERVAL,
+    CONF_CACHE_TIME,
+    CONF_CYCLE_BUDGET,
+    CONF_DISCOVERY,
+    CONF_ESTIMATION,
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_CONCURRENCY,
+    CONF_POLL_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    DEFAULT_CACHE_TIME,
+    DEFAULT_CYCLE_BUDGET,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REQUEST_TIMEOUT,
+    DOMAIN,
+    ESTIMATE_INTERVAL,
+    EVENT_TRANSITION,
+    INFOMESSAGE,
+    KEY_ALARM,
+    KEY_INFOMESSAGE,
+    KEY_STATE,
+    REFRESH_COALESCE_WINDOW,
+    SERVICE_BACKFILL,
+    SERVICE_REFRESH,
+    STATE_FAULT_IGNITION,
+)
+
+# The client and the estimator are only imported once an entry is set up.
+if TYPE_CHECKING:
+    from .estimator import Estimator
+    from .stokercloud_api import Client as StokerCloudClient
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 
-PLATFORMS: list[Platform] = [Platform.NUMBER, Platform.SENSOR]
+REFRESH_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string])}
+)
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
+    Platform.SENSOR,
+]
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the Stokercloud component."""
 
     hass.data[DOMAIN] = {}
+
+    async def async_refresh_service(call: ServiceCall):
+        """Refresh the targeted entries, or all of them."""
+        entry_ids = call.data.get(ATTR_ENTRY_ID) or list(hass.data[DOMAIN])
+        await asyncio.gather(
+            *[
+                hass.data[DOMAIN][entry_id]._coordinator.async_refresh_coalesced()
+                for entry_id in entry_ids
+                if entry_id in hass.data[DOMAIN]
+            ]
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh_service, schema=REFRESH_SCHEMA
+    )
+
+    async def async_backfill_service(call: ServiceCall):
+        """Start backfilling history for the targeted entries, or all of them."""
+        from .backfill import Backfill
+
+        start = call.data[ATTR_START_DATE]
+        end = call.data.get(ATTR_END_DATE) or dt_util.now().date() - timedelta(
+            days=1
+        )
+        entry_ids = call.data.get(ATTR_ENTRY_ID) or list(hass.data[DOMAIN])
+        for entry_id in entry_ids:
+            if entry_id not in hass.data[DOMAIN]:
+                continue
+            backfill = Backfill(hass, hass.data[DOMAIN][entry_id]._coordinator)
+            # Backfills can take a long time, so they run in the background.
+            hass.async_create_background_task(
+                backfill.async_run(start, end), f"{DOMAIN} backfill {entry_id}"
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_backfill_service, schema=BACKFILL_SCHEMA
+    )
     return True
 
 
@@ -37,10 +130,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Stokercloud from a config entry."""
     nbe_user = entry.data[CONF_USERNAME]
     nbe_pass = entry.data[CONF_PASSWORD]
-    stokerCloud = StokerCloudClient(nbe_user, nbe_pass)
+
+    from .stokercloud_api import Client as StokerCloudClient
+
+    options = get_options(entry)
+    stokerCloud = StokerCloudClient(
+        nbe_user,
+        nbe_pass,
+        cache_time_seconds=options[CONF_CACHE_TIME],
+        timeout=options[CONF_REQUEST_TIMEOUT],
+        max_concurrency=options[CONF_MAX_CONCURRENCY],
+        cycle_budget=options[CONF_CYCLE_BUDGET] or None,
+        hedge=options[CONF_HEDGE_REQUESTS],
+    )
 
     # Fetch initial data so we have data when entities subscribe
-    coordinator = IntegrationCoordinator(hass, stokerCloud, nbe_user, 60)
+    coordinator = IntegrationCoordinator(
+        hass,
+        stokerCloud,
+        nbe_user,
+        options[CONF_POLL_INTERVAL],
+        options[CONF_DISCOVERY],
+    )
 
     # 🔑 Load persisted data from disk
     await coordinator.async_load()
@@ -50,9 +161,61 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     hass.data[DOMAIN][entry.entry_id] = HassIntegration(coordinator, nbe_user)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    coordinator.async_set_estimation(options[CONF_ESTIMATION])
+    entry.async_on_unload(lambda: coordinator.async_set_estimation(False))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     return True
 
 
+def get_options(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the entry options merged with their defaults."""
+    return {
+        CONF_POLL_INTERVAL: entry.options.get(
+            CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL
+        ),
+        CONF_CACHE_TIME: entry.options.get(CONF_CACHE_TIME, DEFAULT_CACHE_TIME),
+        CONF_REQUEST_TIMEOUT: entry.options.get(
+            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+        ),
+        CONF_MAX_CONCURRENCY: entry.options.get(
+            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        ),
+        CONF_DISCOVERY: entry.options.get(
+            CONF_DISCOVERY, entry.data.get(CONF_DISCOVERY, False)
+        ),
+        CONF_ESTIMATION: entry.options.get(CONF_ESTIMATION, False),
+        CONF_CYCLE_BUDGET: entry.options.get(
+            CONF_CYCLE_BUDGET, DEFAULT_CYCLE_BUDGET
+        ),
+        CONF_HEDGE_REQUESTS: entry.options.get(CONF_HEDGE_REQUESTS, False),
+    }
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply changed options to the running coordinator and client."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]._coordinator
+    options = get_options(entry)
+
+    # Discovery changes the set of entities, which needs a reload.
+    if options[CONF_DISCOVERY] != coordinator.discovery:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator._api.configure(
+        cache_time_seconds=options[CONF_CACHE_TIME],
+        timeout=options[CONF_REQUEST_TIMEOUT],
+        max_concurrency=options[CONF_MAX_CONCURRENCY],
+        cycle_budget=options[CONF_CYCLE_BUDGET],
+        hedge=options[CONF_HEDGE_REQUESTS],
+    )
+    coordinator.set_poll_interval(options[CONF_POLL_INTERVAL])
+    coordinator.async_set_estimation(options[CONF_ESTIMATION])
+
+    # Refreshing reschedules the next poll with the new interval.
+    await coordinator.async_request_refresh()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     unload_ok = all(
@@ -88,7 +251,12 @@ class IntegrationCoordinator(DataUpdateCoordinator):
     """StokerCloud coordinator."""
 
     def __init__(
-        self, hass, stokerClient: StokerCloudClient, alias: str, pollinterval: int
+        self,
+        hass,
+        stokerClient: StokerCloudClient,
+        alias: str,
+        pollinterval: int,
+        discovery: bool = False,
     ):
         """Initialize my coordinator."""
         super().__init__(
@@ -97,7 +265,9 @@ class IntegrationCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name=f"StokerCloud coordinator for '{alias}'",
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=15),
+            update_interval=timedelta(seconds=pollinterval),
+            # Listeners are only notified when the data actually changed.
+            always_update=False,
         )
 
         self.store = Store(hass, 1, "stokercloud_data.json")
@@ -105,6 +275,188 @@ class IntegrationCoordinator(DataUpdateCoordinator):
 
         self._api = stokerClient
         self._alias = alias
+        self._last_snapshot = None
+        self.last_seen = None
+
+        # Burst polling after a transition; update_interval decays back to
+        # the configured interval once the window has passed.
+        self._poll_interval = timedelta(seconds=pollinterval)
+        self._burst_until: float | None = None
+
+        self._pending_refresh: asyncio.Task | None = None
+
+        # Discovery mode: the first full snapshot is kept until the sensor
+        # platform has built descriptions from it. Discovered keys are left
+        # out of flattening until their entity is enabled and added to hass.
+        self.discovery = discovery
+        self.discovery_snapshot: dict | None = None
+        self.discovered_keys: set[str] = set()
+        self.enabled_keys: set[str] = set()
+        # Keys read by the coordinator, the estimator or a platform entity;
+        # these are never left out, whatever discovery decides.
+        from .estimator import ESTIMATED_KEYS, KEY_OUTPUT
+
+        self.consumed_keys: set[str] = {
+            KEY_ALARM,
+            KEY_STATE,
+            KEY_INFOMESSAGE,
+            KEY_OUTPUT,
+            *ESTIMATED_KEYS,
+        }
+        self._excluded_keys: frozenset[str] = frozenset()
+        self._discovery_pending = discovery
+
+        # Between-poll estimates, published only to the entities of the
+        # estimated keys.
+        self.estimator: Estimator | None = None
+        self._estimate_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._unsub_estimate: CALLBACK_TYPE | None = None
+
+    def set_discovered_keys(self, keys):
+        """Register the keys of discovered entities and drop the snapshot."""
+        self.discovered_keys = set(keys)
+        self.discovery_snapshot = None
+        self._discovery_pending = False
+        self._update_excluded_keys()
+
+    def add_consumed_keys(self, keys):
+        """Register keys a platform reads, so they are always extracted."""
+        self.consumed_keys.update(keys)
+        self._update_excluded_keys()
+
+    def enable_key(self, key: str):
+        """Start extracting a discovered key on the next refresh."""
+        self.enabled_keys.add(key)
+        self._update_excluded_keys()
+
+    def disable_key(self, key: str):
+        """Stop extracting a discovered key."""
+        self.enabled_keys.discard(key)
+        self._update_excluded_keys()
+
+    def _update_excluded_keys(self):
+        # A changed set makes the client flatten again, so the next refresh
+        # is not mistaken for an unchanged payload.
+        self._excluded_keys = frozenset(
+            self.discovered_keys - self.enabled_keys - self.consumed_keys
+        )
+
+    async def async_refresh_coalesced(self):
+        """Refresh once for all callers within the coalescing window.
+
+        Returns when the refreshed data has been applied.
+        """
+        if self._pending_refresh is None:
+            self._pending_refresh = self.hass.async_create_task(
+                self._async_coalesced_refresh()
+            )
+        await asyncio.shield(self._pending_refresh)
+
+    async def _async_coalesced_refresh(self):
+        try:
+            await asyncio.sleep(REFRESH_COALESCE_WINDOW)
+        finally:
+            # Calls from here on wait for the next fetch, not this one.
+            self._pending_refresh = None
+        await self.async_refresh()
+
+    def set_poll_interval(self, seconds: int):
+        """Change the normal polling interval, keeping any running burst."""
+        self._poll_interval = timedelta(seconds=seconds)
+        if self._burst_until is None:
+            self.update_interval = self._poll_interval
+
+    def _start_burst(self):
+        self._burst_until = time.monotonic() + BURST_DURATION
+        self.update_interval = min(
+            timedelta(seconds=BURST_INTERVAL), self._poll_interval
+        )
+
+    def _decay_burst(self):
+        if self._burst_until is None or time.monotonic() < self._burst_until:
+            return
+        # Double the interval each poll until the normal cadence is reached.
+        self.update_interval = min(self.update_interval * 2, self._poll_interval)
+        if self.update_interval == self._poll_interval:
+            self._burst_until = None
+
+    def _detect_transitions(self, previous: dict, current: dict) -> list[dict]:
+        transitions = []
+
+        alarm = current.get(KEY_ALARM)
+        if KEY_ALARM in previous and previous[KEY_ALARM] != alarm:
+            transitions.append({"type": "alarm", "alarm": bool(alarm)})
+
+        state = current.get(KEY_STATE)
+        previous_state = previous.get(KEY_STATE)
+        if previous_state is not None and previous_state != state and (
+            STATE_FAULT_IGNITION in (previous_state, state)
+        ):
+            transitions.append(
+                {
+                    "type": "fault_ignition",
+                    "fault": state == STATE_FAULT_IGNITION,
+                    "state": state,
+                }
+            )
+
+        message = current.get(KEY_INFOMESSAGE)
+        if KEY_INFOMESSAGE in previous and previous[KEY_INFOMESSAGE] != message:
+            transitions.append(
+                {
+                    "type": "info_message",
+                    "code": message,
+                    "message": INFOMESSAGE.get(str(message), [message])[0],
+                }
+            )
+
+        return transitions
+
+    @callback
+    def async_set_estimation(self, enabled: bool):
+        """Start or stop publishing estimates between polls."""
+        if enabled and self.estimator is None:
+            from .estimator import Estimator
+
+            self.estimator = Estimator()
+            if self.data:
+                self.estimator.update(self.data, time.monotonic())
+            self._unsub_estimate = async_track_time_interval(
+                self.hass,
+                self._async_estimate_tick,
+                timedelta(seconds=ESTIMATE_INTERVAL),
+            )
+        elif not enabled and self.estimator is not None:
+            self._unsub_estimate()
+            self._unsub_estimate = None
+            self.estimator = None
+
+    @callback
+    def async_add_estimate_listener(
+        self, key: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call `update_callback` whenever a new estimate for `key` is published."""
+        listeners = self._estimate_listeners.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_estimate_tick(self, _now=None):
+        if self.estimator is None or not self.data:
+            return
+
+        for key, value in self.estimator.estimate(time.monotonic()).items():
+            listeners = self._estimate_listeners.get(key)
+            if not listeners or self.data.get(key) == value:
+                continue
+            self.data[key] = value
+            for update_callback in list(listeners):
+                update_callback()
 
     async def async_load(self):
         stored = await self.store.async_load()
@@ -119,32 +471,68 @@ class IntegrationCoordinator(DataUpdateCoordinator):
 
         try:
             # controller_data = await self._api.controller_data()
-            controller_data = await self._api.controller_data_json()
+            # While bursting, every poll goes to the cloud.
+            controller_data = await self._api.controller_data_json(
+                max_age=0 if self._burst_until is not None else None,
+                exclude=self._excluded_keys,
+            )
+            self.last_seen = dt_util.utcnow()
+            self._decay_burst()
+
+            # The client hands back the same object when the payload is
+            # unchanged, so there is nothing to merge or fan out.
+            if controller_data is self._last_snapshot and self.data:
+                if self.estimator is None:
+                    return self.data
+                # It is still a real sample: it replaces published estimates
+                # and re-anchors the estimator.
+                from .estimator import ESTIMATED_KEYS
+
+                data = dict(self.data)
+                for key in ESTIMATED_KEYS:
+                    if key in controller_data:
+                        data[key] = controller_data[key]
+                self.estimator.update(data, time.monotonic())
+                return data
+            # Until the first live refresh, self.data is what async_load
+            # restored from the Store, so changes against it are stale.
+            live_previous = self._last_snapshot is not None
+            self._last_snapshot = controller_data
+
+            # The client replaces its snapshot rather than changing it, so it
+            # can be kept as is; coordinator data is always a copy of it.
+            if self._discovery_pending and self.discovery_snapshot is None:
+                self.discovery_snapshot = controller_data
+            controller_data = dict(controller_data)
 
             # 🔑 Preserve internal values across refreshes
             for key, value in self.data.items():
                 if key.startswith("internal"):
                     controller_data[key] = value
 
+            # A real sample replaces and re-anchors any published estimates.
+            if self.estimator is not None:
+                self.estimator.update(controller_data, time.monotonic())
+
+            transitions = (
+                self._detect_transitions(self.data, controller_data)
+                if live_previous
+                else []
+            )
+            for transition in transitions:
+                self.hass.bus.async_fire(
+                    EVENT_TRANSITION, {"alias": self._alias, **transition}
+                )
+            if transitions:
+                self._start_burst()
+
             return controller_data
 
-        except:
+        except TimeoutError as err:
+            # Keep the last data rather than stalling on a slow cloud.
+            _LOGGER.error("Stokercloud _async_update_data exceeded its budget")
+            raise UpdateFailed("StokerCloud did not answer in time") from err
+        except Exception as err:
             _LOGGER.error("Stokercloud _async_update_data failed")
+            raise UpdateFailed("StokerCloud update failed") from err
 
-
-@dataclass(frozen=True, kw_only=True)
-class IntegrationSensorEntityDescription(SensorEntityDescription):
-    """Custom SensorEntityDescription with extra attributes."""
-
-    value: Any  # extra field
-    format: str | None = None  # optional extra field
-
-
-@dataclass(frozen=True, kw_only=True)
-class IntegrationNumberEntityDescription(NumberEntityDescription):
-    """Custom SensorEntityDescription with extra attributes."""
-
-    value: Any  # extra field
-    format: str | None = None  # optional extra field
-    default_value: float | None = None  # optional extra field
-    updateParams: list[str] = field(default_factory=list)  # optional extra field
@@ -0,0 +1,278 @@
+"""Backfill StokerCloud history into long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    async_adjust_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfMass, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import MassConverter, TemperatureConverter
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from . import IntegrationCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Days fetched and imported together. The Store records per statistic the
+# completed date ranges, each with the sum it added, so repeated or earlier
+# backfills only fetch what is missing and keep the cumulative sum continuous.
+# Days are local dates of the Home Assistant time zone; today is never
+# backfilled, as its page is still growing.
+BATCH_DAYS = 7
+# Requests per second and requests in flight while backfilling.
+REQUEST_RATE = 2
+MAX_CONCURRENT_PAGES = 4
+
+# statistic name -> (graph requested from the cloud, unit, unit converter,
+# summed or averaged)
+BACKFILL_SERIES = {
+    "consumption": ("hopper", UnitOfMass.KILOGRAMS, MassConverter, True),
+    "boiler_temperature": (
+        "boiler",
+        UnitOfTemperature.CELSIUS,
+        TemperatureConverter,
+        False,
+    ),
+}
+
+
+class RateLimiter:
+    """Space request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _samples(page) -> list[tuple[datetime, float]]:
+    """Return (time, value) pairs from a graph page.
+
+    Pages are either a list of [epoch ms, value] pairs or an object holding
+    that list under "data".
+    """
+    if isinstance(page, dict):
+        page = page.get("data") or []
+    samples = []
+    for point in page:
+        try:
+            moment = datetime.fromtimestamp(point[0] / 1000, timezone.utc)
+            samples.append((moment, float(point[1])))
+        except (TypeError, ValueError, IndexError):
+            continue
+    return samples
+
+
+def _hourly(samples, summed: bool, running_sum: float):
+    """Aggregate samples into hourly statistics, continuing `running_sum`."""
+    buckets = defaultdict(list)
+    for moment, value in samples:
+        buckets[moment.replace(minute=0, second=0, microsecond=0)].append(value)
+
+    statistics = []
+    for start in sorted(buckets):
+        values = buckets[start]
+        if summed:
+            running_sum += sum(values)
+            statistics.append(
+                StatisticData(start=start, state=sum(values), sum=running_sum)
+            )
+        else:
+            statistics.append(
+                StatisticData(
+                    start=start,
+                    mean=sum(values) / len(values),
+                    min=min(values),
+                    max=max(values),
+                )
+            )
+    return statistics, running_sum
+
+
+def _load_ranges(stored) -> list[tuple[date, date, float]]:
+    return [
+        (date.fromisoformat(first), date.fromisoformat(last), total)
+        for first, last, total in stored
+    ]
+
+
+def _dump_ranges(ranges) -> list:
+    return [
+        [first.isoformat(), last.isoformat(), total] for first, last, total in ranges
+    ]
+
+
+def _add_range(ranges, first: date, last: date, total: float):
+    """Add a completed range, merging it with adjacent ones."""
+    merged = []
+    for r_first, r_last, r_total in sorted([*ranges, (first, last, total)]):
+        if merged and r_first <= merged[-1][1] + timedelta(days=1):
+            m_first, m_last, m_total = merged[-1]
+            merged[-1] = (m_first, max(m_last, r_last), m_total + r_total)
+        else:
+            merged.append((r_first, r_last, r_total))
+    return merged
+
+
+def _missing_runs(start: date, end: date, ranges):
+    """Yield the (first, last) runs of days in start..end not yet completed."""
+    day = start
+    for first, last, _total in sorted(ranges):
+        if last < day:
+            continue
+        if first > end:
+            break
+        if first > day:
+            yield day, first - timedelta(days=1)
+        day = last + timedelta(days=1)
+    if day <= end:
+        yield day, end
+
+
+class Backfill:
+    """Page through the history of one entry and import it as statistics."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: IntegrationCoordinator):
+        self.hass = hass
+        self.coordinator = coordinator
+        self.store = Store(hass, 1, f"{DOMAIN}_backfill_{coordinator._alias}.json")
+        self._limiter = RateLimiter(REQUEST_RATE)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+    def _statistic_id(self, name: str) -> str:
+        alias = "".join(c if c.isalnum() else "_" for c in self.coordinator._alias)
+        return f"{DOMAIN}:{alias.lower()}_{name}"
+
+    async def _fetch(self, graph: str, day: date):
+        async with self._semaphore:
+            await self._limiter.wait()
+            try:
+                return await self.coordinator._api.graph_data(graph, day)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Stokercloud backfill of %s on %s failed", graph, day)
+                raise
+
+    async def _last_imported_sum(self, statistic_id: str) -> float:
+        """Return the sum of the newest statistic already in the recorder."""
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, False, {"sum"}
+        )
+        rows = last.get(statistic_id)
+        return (rows[0].get("sum") or 0.0) if rows else 0.0
+
+    async def async_run(self, start: date, end: date):
+        """Backfill every series from `start` to `end`, skipping completed days."""
+        # A partial day must not be recorded as completed.
+        end = min(end, dt_util.now().date() - timedelta(days=1))
+        if start > end:
+            _LOGGER.warning(
+                "Stokercloud backfill for %s has no completed days to import",
+                self.coordinator._alias,
+            )
+            return
+
+        checkpoints = await self.store.async_load() or {}
+
+        for name, (graph, unit, converter, summed) in BACKFILL_SERIES.items():
+            statistic_id = self._statistic_id(name)
+            state = checkpoints.get(name)
+            if not state or "ranges" not in state:
+                # Statistics imported before the Store existed (or after it
+                # was lost) become the base the new sums continue from.
+                offset = await self._last_imported_sum(statistic_id) if summed else 0
+                state = checkpoints[name] = {"ranges": [], "offset": offset}
+            ranges = _load_ranges(state["ranges"])
+
+            metadata = StatisticMetaData(
+                has_sum=summed,
+                mean_type=(
+                    StatisticMeanType.NONE if summed else StatisticMeanType.ARITHMETIC
+                ),
+                name=f"{self.coordinator._alias} {name.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_class=converter.UNIT_CLASS,
+                unit_of_measurement=unit,
+            )
+
+            for run_start, run_end in _missing_runs(start, end, ranges):
+                # Sums continue from everything imported before this run.
+                running_sum = state["offset"] + sum(
+                    total for _first, last, total in ranges if last < run_start
+                )
+                later_data = any(first > run_end for first, _last, _t in ranges)
+                day = run_start
+
+                while day <= run_end:
+                    days = [
+                        day + timedelta(days=offset)
+                        for offset in range(BATCH_DAYS)
+                        if day + timedelta(days=offset) <= run_end
+                    ]
+                    pages = await asyncio.gather(
+                        *[self._fetch(graph, d) for d in days]
+                    )
+
+                    samples = [sample for page in pages for sample in _samples(page)]
+                    previous_sum = running_sum
+                    statistics, running_sum = _hourly(samples, summed, running_sum)
+                    if statistics:
+                        async_add_external_statistics(self.hass, metadata, statistics)
+
+                    total = running_sum - previous_sum
+                    if later_data and total:
+                        # Shift the sums of statistics imported after this gap.
+                        async_adjust_statistics(
+                            self.hass,
+                            statistic_id,
+                            dt_util.as_utc(
+                                dt_util.start_of_local_day(
+                                    days[-1] + timedelta(days=1)
+                                )
+                            ),
+                            total,
+                            unit,
+                        )
+
+                    # Only record the batch once it has been handed over.
+                    ranges = _add_range(ranges, days[0], days[-1], total)
+                    state["ranges"] = _dump_ranges(ranges)
+                    state["sum"] = state["offset"] + sum(t for _f, _l, t in ranges)
+                    await self.store.async_save(checkpoints)
+                    day = days[-1] + timedelta(days=1)
+
+            _LOGGER.info(
+                "Stokercloud backfill of %s for %s done from %s to %s",
+                name,
+                self.coordinator._alias,
+                start,
+                end,
+            )
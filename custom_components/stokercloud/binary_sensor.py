@@ -1,31 +1,42 @@
 """Platform for binary_sensor integration."""
 
+from dataclasses import dataclass
 import logging
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntityDescription
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import IntegrationEntityDescription
 from .const import ALARM, DOMAIN, MANUFACTURER, MODEL, RUNNING
-
-# from .const import CLIMATE_CONTROL_STEERING_WHEEL_HEAT, DOMAIN, DOOR_LOCK, GEAR_IN_PARK
+from .descriptions import ValueTransformMixin, compile_transform
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class IntegrationBinarySensorEntityDescription(
+    BinarySensorEntityDescription, ValueTransformMixin
+):
+    """Custom BinarySensorEntityDescription with extra attributes."""
+
+    value: Any  # extra field
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     _LOGGER.debug("Setup sensors")
 
     my_data = hass.data[DOMAIN][entry.entry_id]
+    my_data._coordinator.add_consumed_keys(sensor.key for sensor in BINARY_SENSORS)
 
-    entities: list[IntegrationSensor] = []
-
-    # for sensor in SENSORS:
     entities: list[IntegrationSensor] = [
         IntegrationSensor(my_data._coordinator, sensor, my_data)
         for sensor in BINARY_SENSORS
@@ -35,28 +46,28 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class IntegrationSensor(CoordinatorEntity):
-    """Sensor used by all entities, inherits from CoordinatorEntity."""
+class IntegrationSensor(CoordinatorEntity, BinarySensorEntity):
+    """Binary sensor used by all entities, inherits from CoordinatorEntity."""
 
-    def __init__(self, coordinator, sensor: IntegrationEntityDescription, client):
+    def __init__(
+        self, coordinator, sensor: IntegrationBinarySensorEntityDescription, client
+    ):
         """Pass coordinator to CoordinatorEntity."""
         super().__init__(coordinator)
         self._data = client
         self._coordinator = coordinator
-        self.entity_description = sensor
+        self.entity_description: IntegrationBinarySensorEntityDescription = sensor
+        self._transform = compile_transform(sensor)
         self._attr_unique_id = f"{self.coordinator._alias}_{sensor.key}"
         self._attr_name = f"{self.coordinator._alias} {sensor.name}"
+        self._attr_is_on = None
 
         _LOGGER.info(self._attr_unique_id)
 
-        # if "climate_control_steering_wheel_heat" in self.entity_description.key:
-        # self.options = LIST_CLIMATE_CONTROL_STEERING_WHEEL_HEAT
-        # self.device_class = SensorDeviceClass.ENUM
-
     @property
     def device_info(self):
         """Return device information about this entity."""
-        _LOGGER.debug("My Fisker: device_info")
+        _LOGGER.debug("StokerCloudBinarySensor: device_info")
 
         return {
             "identifiers": {(DOMAIN, self._coordinator._alias)},
@@ -66,41 +77,26 @@ class IntegrationSensor(CoordinatorEntity):
         }
 
     @property
-    def icon(self):
-        return self.entity_description.icon
+    def should_poll(self):
+        return False
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._handle_coordinator_update()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-
-        if self.entity_description.key:
+        try:
             val = self.coordinator.data[self.entity_description.key]
+        except KeyError:
+            _LOGGER.warning(
+                f"The item {self.entity_description.key} is not returned from the 'cloud'"
+            )
+            return
 
-            self._attr_state = val
-
-            if "alarm" in self.entity_description.key:
-                self._attr_state = ALARM[val][0]
-            elif "running" in self.entity_description.key:
-                self._attr_state = RUNNING[val][0]
-
-            data_available = True
-            self._attr_available = data_available
-
-        # Only call async_write_ha_state if the state has changed
-        if data_available:
-            self.async_write_ha_state()
-
-    @property
-    def should_poll(self):
-        return False
-
-    @property
-    def state(self):
-        try:
-            state = self._attr_state
-        except (KeyError, ValueError):
-            return None
-        return state
+        self._attr_is_on = self._transform(val)
+        self.async_write_ha_state()
 
 
 # Get an item by its key
@@ -113,21 +109,23 @@ def get_sensor_by_key(key):
 
 """All binary_sensor entities."""
 
-BINARY_SENSORS: tuple[SensorEntityDescription, ...] = (
-    IntegrationEntityDescription(
+BINARY_SENSORS: tuple[IntegrationBinarySensorEntityDescription, ...] = (
+    IntegrationBinarySensorEntityDescription(
         key="miscdata_running",
         name="Running",
-        icon="mdi:radiator",
-        device_class=None,
-        native_unit_of_measurement=None,
+        icon=RUNNING[True][1],
+        device_class=BinarySensorDeviceClass.RUNNING,
         value=lambda data, key: data[key],
+        value_map={0: False, 1: True},
+        fallback=None,
     ),
-    IntegrationEntityDescription(
+    IntegrationBinarySensorEntityDescription(
         key="miscdata_alarm",
         name="Alarm",
-        icon="mdi:alarm-light-outline",
-        device_class=None,
-        native_unit_of_measurement=None,
+        icon=ALARM[True][1],
+        device_class=BinarySensorDeviceClass.PROBLEM,
         value=lambda data, key: data[key],
+        value_map={0: False, 1: True},
+        fallback=None,
     ),
 )
@@ -1,12 +1,30 @@
 from homeassistant import config_entries
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
+from homeassistant.core import callback
 import voluptuous as vol
-from .const import DATA_SCHEMA, DOMAIN
+from .const import (
+    CONF_CACHE_TIME,
+    CONF_CYCLE_BUDGET,
+    CONF_DISCOVERY,
+    CONF_ESTIMATION,
+    CONF_HEDGE_REQUESTS,
+    CONF_MAX_CONCURRENCY,
+    CONF_POLL_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    DATA_SCHEMA,
+    DEFAULT_CACHE_TIME,
+    DEFAULT_CYCLE_BUDGET,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REQUEST_TIMEOUT,
+    DOMAIN,
+)
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_USERNAME): str,
         vol.Required(CONF_PASSWORD): str,
+        vol.Optional(CONF_DISCOVERY, default=False): bool,
     }
 )
 
@@ -30,3 +48,60 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return OptionsFlowHandler()
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Tune polling and client settings of an existing entry."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data = self.config_entry.data
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_POLL_INTERVAL,
+                    default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_CACHE_TIME,
+                    default=options.get(CONF_CACHE_TIME, DEFAULT_CACHE_TIME),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Required(
+                    CONF_REQUEST_TIMEOUT,
+                    default=options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                vol.Required(
+                    CONF_MAX_CONCURRENCY,
+                    default=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                vol.Required(
+                    CONF_CYCLE_BUDGET,
+                    default=options.get(CONF_CYCLE_BUDGET, DEFAULT_CYCLE_BUDGET),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                vol.Required(
+                    CONF_HEDGE_REQUESTS,
+                    default=options.get(CONF_HEDGE_REQUESTS, False),
+                ): bool,
+                vol.Required(
+                    CONF_DISCOVERY,
+                    default=options.get(
+                        CONF_DISCOVERY, data.get(CONF_DISCOVERY, False)
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_ESTIMATION,
+                    default=options.get(CONF_ESTIMATION, False),
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -6,6 +6,41 @@ import homeassistant.helpers.config_validation as cv
 DOMAIN = "stokercloud"
 DATA_SCHEMA = vol.Schema({vol.Required(CONF_USERNAME): cv.string})
 
+CONF_DISCOVERY = "discover_entities"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_CACHE_TIME = "cache_time_seconds"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_MAX_CONCURRENCY = "max_concurrent_requests"
+CONF_ESTIMATION = "estimate_between_polls"
+CONF_CYCLE_BUDGET = "cycle_budget"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+
+DEFAULT_POLL_INTERVAL = 15
+DEFAULT_CACHE_TIME = 10
+DEFAULT_REQUEST_TIMEOUT = 30
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_CYCLE_BUDGET = 45
+
+ESTIMATE_INTERVAL = 5
+
+SERVICE_REFRESH = "refresh"
+SERVICE_BACKFILL = "backfill"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+# Refresh calls arriving within this many seconds share one fetch per entry.
+REFRESH_COALESCE_WINDOW = 0.5
+
+# Fired on alarm, fault-ignition and info-message transitions.
+EVENT_TRANSITION = f"{DOMAIN}_transition"
+BURST_INTERVAL = 5
+BURST_DURATION = 120
+
+KEY_ALARM = "miscdata_alarm"
+KEY_STATE = "miscdata_state_value"
+KEY_INFOMESSAGE = "infomessages_0"
+STATE_FAULT_IGNITION = "state_13"
+
 MANUFACTURER = "NBE"
 MODEL = "Stoker cloud boiler"
 
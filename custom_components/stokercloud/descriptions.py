@@ -0,0 +1,56 @@
+"""Value transforms shared by the StokerCloud entity descriptions.
+
+Kept free of Home Assistant imports so a platform only loads its own
+component; the description classes live in their platform modules.
+"""
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+# Default fallback: hand the raw value through unchanged.
+RAW_VALUE = object()
+
+
+@dataclass(frozen=True, kw_only=True)
+class ValueTransformMixin:
+    """How a raw payload value becomes the entity state.
+
+    `value_map` translates codes, `scale` multiplies numeric values and
+    `fallback` is used for codes missing from the map or values that are not
+    numeric; by default the raw value is passed through.
+    """
+
+    value_map: Mapping[Any, Any] | None = None
+    scale: float | None = None
+    fallback: Any = RAW_VALUE
+
+
+def _identity(val):
+    return val
+
+
+def compile_transform(description: ValueTransformMixin) -> Callable[[Any], Any]:
+    """Resolve the value transform of a description once, at setup."""
+    value_map = description.value_map
+    scale = description.scale
+    fallback = description.fallback
+
+    if value_map is not None:
+        value_map = dict(value_map)
+        if fallback is RAW_VALUE:
+            return lambda val: value_map.get(val, val)
+        return lambda val: value_map.get(val, fallback)
+
+    if scale is not None:
+
+        def scaled(val):
+            try:
+                return float(val) * scale
+            except (TypeError, ValueError):
+                return val if fallback is RAW_VALUE else fallback
+
+        return scaled
+
+    return _identity
+
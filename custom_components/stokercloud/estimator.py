@@ -0,0 +1,113 @@
+"""Between-poll estimates for slow-moving StokerCloud values."""
+
+from collections import deque
+
+KEY_HOPPER_CONTENT = "frontdata_0_value"
+KEY_TOTAL_CONSUMPTION = "hopperdata_2_value"
+KEY_BOILER_TEMPERATURE = "frontdata_1_value"
+KEY_OUTPUT = "miscdata_output"
+KEY_PELLET_ENERGY = "internaldata_pellet_energy_per_kg"
+
+ESTIMATED_KEYS = (KEY_HOPPER_CONTENT, KEY_TOTAL_CONSUMPTION, KEY_BOILER_TEMPERATURE)
+
+DEFAULT_PELLET_ENERGY = 5.0  # kWh/kg
+HISTORY_SIZE = 10
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Estimator:
+    """Predict hopper content, consumption and boiler temperature between polls.
+
+    Every real sample re-anchors the estimates, so errors never accumulate past
+    one poll interval.
+    """
+
+    def __init__(self, max_temperature_drift: float = 5.0):
+        self.max_temperature_drift = max_temperature_drift
+        self._anchor_time = None
+        self._anchor = {}
+        self._output = 0.0
+        self._pellet_energy = DEFAULT_PELLET_ENERGY
+        # (time, total consumption, output) of recent samples
+        self._history = deque(maxlen=HISTORY_SIZE)
+        self._temperature_slope = 0.0
+
+    def update(self, data: dict, now: float):
+        """Anchor the estimates to a real sample taken at monotonic time `now`."""
+        previous_temperature = self._anchor.get(KEY_BOILER_TEMPERATURE)
+        previous_time = self._anchor_time
+
+        self._anchor = {
+            key: value
+            for key in ESTIMATED_KEYS
+            if (value := _as_float(data.get(key))) is not None
+        }
+        self._anchor_time = now
+        self._output = _as_float(data.get(KEY_OUTPUT)) or 0.0
+        self._pellet_energy = (
+            _as_float(data.get(KEY_PELLET_ENERGY)) or DEFAULT_PELLET_ENERGY
+        )
+
+        total = self._anchor.get(KEY_TOTAL_CONSUMPTION)
+        if total is not None:
+            self._history.append((now, total, self._output))
+
+        temperature = self._anchor.get(KEY_BOILER_TEMPERATURE)
+        if (
+            temperature is not None
+            and previous_temperature is not None
+            and previous_time is not None
+            and now > previous_time
+        ):
+            self._temperature_slope = (temperature - previous_temperature) / (
+                now - previous_time
+            )
+        else:
+            self._temperature_slope = 0.0
+
+    def consumption_rate(self) -> float:
+        """Return the current pellet consumption in kg/s."""
+        if self._output <= 0:
+            return 0.0
+
+        if len(self._history) >= 2:
+            first_time, first_total, _ = self._history[0]
+            last_time, last_total, _ = self._history[-1]
+            mean_output = sum(sample[2] for sample in self._history) / len(
+                self._history
+            )
+            if last_time > first_time and last_total > first_total and mean_output:
+                slope = (last_total - first_total) / (last_time - first_time)
+                # Scale the measured slope to the output the boiler runs at now.
+                return slope * self._output / mean_output
+
+        return self._output / self._pellet_energy / 3600
+
+    def estimate(self, now: float) -> dict[str, float]:
+        """Return estimates for the keys that can be predicted at time `now`."""
+        if self._anchor_time is None:
+            return {}
+
+        elapsed = now - self._anchor_time
+        burned = self.consumption_rate() * elapsed
+        estimates = {}
+
+        if (total := self._anchor.get(KEY_TOTAL_CONSUMPTION)) is not None:
+            estimates[KEY_TOTAL_CONSUMPTION] = round(total + burned, 2)
+
+        if (hopper := self._anchor.get(KEY_HOPPER_CONTENT)) is not None:
+            estimates[KEY_HOPPER_CONTENT] = round(max(hopper - burned, 0.0), 2)
+
+        if (temperature := self._anchor.get(KEY_BOILER_TEMPERATURE)) is not None:
+            drift = self._temperature_slope * elapsed
+            limit = self.max_temperature_drift
+            drift = max(-limit, min(drift, limit))
+            estimates[KEY_BOILER_TEMPERATURE] = round(temperature + drift, 1)
+
+        return estimates
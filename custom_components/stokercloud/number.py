@@ -1,6 +1,10 @@
+from dataclasses import dataclass, field
+from typing import Any
+
 from homeassistant.components.number import (
     NumberDeviceClass,
     NumberEntity,
+    NumberEntityDescription,
     NumberMode,
     RestoreEntity,
     callback,
@@ -10,8 +14,18 @@ from homeassistant.const import UnitOfEnergy, UnitOfMass
 from homeassistant.core import _LOGGER, HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import IntegrationNumberEntityDescription
 from .const import DOMAIN, MANUFACTURER, MODEL
+from .descriptions import ValueTransformMixin, compile_transform
+
+
+@dataclass(frozen=True, kw_only=True)
+class IntegrationNumberEntityDescription(NumberEntityDescription, ValueTransformMixin):
+    """Custom NumberEntityDescription with extra attributes."""
+
+    value: Any  # extra field
+    format: str | None = None  # optional extra field
+    default_value: float | None = None  # optional extra field
+    updateParams: list[str] = field(default_factory=list)  # optional extra field
 
 
 async def async_setup_entry(
@@ -23,6 +37,7 @@ async def async_setup_entry(
     # Fetch initial data so we have data when entities subscribe
     # await CustomIntegration._coordinator.async_config_entry_first_refresh()
 
+    stoker._coordinator.add_consumed_keys(number.key for number in NUMBER_SENSORS)
     entities: list[IntegrationNumber] = [
         IntegrationNumber(stoker, number) for number in NUMBER_SENSORS
     ]
@@ -55,6 +70,7 @@ class IntegrationNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
         self._data = client
         self.coordinator = client._coordinator
         self.entity_description: IntegrationNumberEntityDescription = number
+        self._transform = compile_transform(number)
         self._attr_unique_id = f"{self.coordinator._alias}_{number.key}"
         self._attr_name = f"{self.coordinator._alias} {number.name}"
 
@@ -65,6 +81,15 @@ class IntegrationNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        # Loaded with the coordinator, not with the platform module.
+        from .estimator import ESTIMATED_KEYS
+
+        if self.entity_description.key in ESTIMATED_KEYS:
+            self.async_on_remove(
+                self.coordinator.async_add_estimate_listener(
+                    self.entity_description.key, self._handle_coordinator_update
+                )
+            )
 
         last_state = await self.async_get_last_state()
         if last_state and last_state.state not in ("unknown", "unavailable"):
@@ -118,27 +143,20 @@ class IntegrationNumber(CoordinatorEntity, NumberEntity, RestoreEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        data_available = False
-
-        # if self.entity_description.key:
         if not self.coordinator.data:
             _LOGGER.warning("StokerCloudNumber: No data received from coordinator")
             return
-        if self.entity_description.key in self.coordinator.data:
+        try:
             val = self.coordinator.data[self.entity_description.key]
-
-            self._attr_native_value = val
-
-            data_available = True
-            self._attr_available = data_available
-        else:
+        except KeyError:
             _LOGGER.warning(
                 f"The item {self.entity_description.key} is not returned from the 'cloud'"
             )
+            return
 
-        # Only call async_write_ha_state if the state has changed
-        if data_available:
-            self.async_write_ha_state()
+        self._attr_native_value = self._transform(val)
+        self._attr_available = True
+        self.async_write_ha_state()
 
 
 NUMBER_SENSORS: tuple[IntegrationNumberEntityDescription, ...] = (
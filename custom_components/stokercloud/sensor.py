@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 import datetime
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -12,6 +14,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import (
     PERCENTAGE,
+    UnitOfEnergy,
     UnitOfMass,
     UnitOfPower,
     UnitOfSpeed,
@@ -20,14 +23,23 @@ from homeassistant.const import (
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import IntegrationCoordinator, IntegrationSensorEntityDescription
+from . import IntegrationCoordinator
 from .const import DOMAIN, MANUFACTURER, MODEL, STATE_STATE
+from .descriptions import ValueTransformMixin, compile_transform
 
 _LOGGER = logging.getLogger(__name__)
 
 MIN_TIME_BETWEEN_UPDATES = datetime.timedelta(minutes=1)
 
 
+@dataclass(frozen=True, kw_only=True)
+class IntegrationSensorEntityDescription(SensorEntityDescription, ValueTransformMixin):
+    """Custom SensorEntityDescription with extra attributes."""
+
+    value: Any  # extra field
+    format: str | None = None  # optional extra field
+
+
 async def async_setup_entry(hass, config, async_add_entities):
     """Set up the sensor platform."""
     stoker = hass.data[DOMAIN][config.entry_id]
@@ -37,9 +49,76 @@ async def async_setup_entry(hass, config, async_add_entities):
         for sensor in SENSORS_BOILER
     ]
 
+    coordinator = stoker._coordinator
+    coordinator.add_consumed_keys(sensor.key for sensor in SENSORS_BOILER)
+    if coordinator.discovery and coordinator.discovery_snapshot:
+        # The other platforms may not be set up yet; register their keys
+        # here so none of them is discovered as a disabled duplicate.
+        from .binary_sensor import BINARY_SENSORS
+        from .number import NUMBER_SENSORS
+
+        coordinator.add_consumed_keys(sensor.key for sensor in BINARY_SENSORS)
+        coordinator.add_consumed_keys(number.key for number in NUMBER_SENSORS)
+        descriptions = build_discovered_descriptions(
+            coordinator.discovery_snapshot, coordinator.consumed_keys
+        )
+        coordinator.set_discovered_keys(sensor.key for sensor in descriptions)
+        entities.extend(
+            StokerCloudDiscoveredSensor(coordinator, sensor, stoker)
+            for sensor in descriptions
+        )
+
     async_add_entities(entities)
 
 
+def build_discovered_descriptions(
+    data: dict, known_keys: set[str]
+) -> list[IntegrationSensorEntityDescription]:
+    """Build disabled-by-default descriptions for every unhandled payload field."""
+    descriptions = []
+
+    for key, val in data.items():
+        if (
+            key in known_keys
+            or key.startswith("internal")
+            or key.endswith(DISCOVERY_METADATA_SUFFIXES)
+            or isinstance(val, (dict, list))
+        ):
+            continue
+
+        base = key[: -len("_value")] if key.endswith("_value") else key
+        name = data.get(f"{base}_name") or data.get(f"{base}_id") or key
+
+        device_class, unit = None, None
+        unit_text = data.get(f"{base}_unit")
+        if unit_text is not None and _is_number(val):
+            device_class, unit = DISCOVERY_UNITS.get(
+                str(unit_text).strip().lower(), (None, None)
+            )
+
+        descriptions.append(
+            IntegrationSensorEntityDescription(
+                key=key,
+                name=f"{name}".replace("_", " ").strip().capitalize(),
+                icon="mdi:information",
+                device_class=device_class,
+                native_unit_of_measurement=unit,
+                entity_registry_enabled_default=False,
+                value=lambda data, key: data[key],
+            )
+        )
+
+    return descriptions
+
+
+def _is_number(val) -> bool:
+    try:
+        float(val)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
 class StokerCloudSensor(CoordinatorEntity, SensorEntity):
     """Representation of a meter reading sensor."""
 
@@ -53,6 +132,7 @@ class StokerCloudSensor(CoordinatorEntity, SensorEntity):
         self._data = client
         self.coordinator = coordinator
         self.entity_description: IntegrationSensorEntityDescription = sensor
+        self._transform = compile_transform(sensor)
         self._attr_unique_id = f"{self.coordinator._alias}_{sensor.key}"
         self._attr_name = f"{self.coordinator._alias} {sensor.name}"
 
@@ -87,34 +167,70 @@ class StokerCloudSensor(CoordinatorEntity, SensorEntity):
     async def async_added_to_hass(self):
         """Handle entity addition to hass."""
         # Add the coordinator listener for data updates
-        self.coordinator.async_add_listener(self._handle_coordinator_update)
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        # Loaded with the coordinator, not with the platform module.
+        from .estimator import ESTIMATED_KEYS
+
+        if self.entity_description.key in ESTIMATED_KEYS:
+            self.async_on_remove(
+                self.coordinator.async_add_estimate_listener(
+                    self.entity_description.key, self._handle_coordinator_update
+                )
+            )
         # Ensure that data is fetched initially
         await self.coordinator.async_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        data_available = False
-
-        # if self.entity_description.key:
-        if self.entity_description.key in self.coordinator.data:
+        try:
             val = self.coordinator.data[self.entity_description.key]
-
-            if "state" in self.entity_description.key:
-                self._attr_native_value = STATE_STATE[val][0]
-            else:
-                self._attr_native_value = val
-
-            data_available = True
-            self._attr_available = data_available
-        else:
+        except KeyError:
             _LOGGER.warning(
                 f"The item {self.entity_description.key} is not returned from the 'cloud'"
             )
+            return
+
+        self._attr_native_value = self._transform(val)
+        self._attr_available = True
+        self.async_write_ha_state()
+
+
+class StokerCloudDiscoveredSensor(StokerCloudSensor):
+    """Sensor built from the payload in discovery mode.
+
+    Its key is only extracted by the coordinator while the entity is enabled.
+    """
+
+    async def async_added_to_hass(self):
+        """Start extracting the key before the first refresh."""
+        self.coordinator.enable_key(self.entity_description.key)
+        await super().async_added_to_hass()
+
+    async def async_will_remove_from_hass(self):
+        """Stop extracting the key once the entity is gone."""
+        self.coordinator.disable_key(self.entity_description.key)
+        await super().async_will_remove_from_hass()
+
+
+# Flattened keys that describe a field rather than carry its value.
+DISCOVERY_METADATA_SUFFIXES = ("_id", "_name", "_unit")
 
-        # Only call async_write_ha_state if the state has changed
-        if data_available:
-            self.async_write_ha_state()
+# Unit strings as reported by the payload, mapped to device class and unit.
+DISCOVERY_UNITS = {
+    "°c": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    "c": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    "deg": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    "kg": (SensorDeviceClass.WEIGHT, UnitOfMass.KILOGRAMS),
+    "g": (SensorDeviceClass.WEIGHT, UnitOfMass.GRAMS),
+    "kw": (SensorDeviceClass.POWER, UnitOfPower.KILO_WATT),
+    "kwh": (SensorDeviceClass.ENERGY, UnitOfEnergy.KILO_WATT_HOUR),
+    "%": (None, PERCENTAGE),
+    "pct": (None, PERCENTAGE),
+    "m/s": (SensorDeviceClass.WIND_SPEED, UnitOfSpeed.METERS_PER_SECOND),
+}
 
 
 SENSORS_BOILER: tuple[IntegrationSensorEntityDescription, ...] = (
@@ -189,6 +305,7 @@ SENSORS_BOILER: tuple[IntegrationSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.ENUM,
         native_unit_of_measurement=None,
         value=lambda data, key: data[key],
+        value_map={code: state[0] for code, state in STATE_STATE.items()},
     ),
     IntegrationSensorEntityDescription(
         key="serial",
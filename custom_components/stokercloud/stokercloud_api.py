@@ -1,12 +1,19 @@
-import decimal
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
 from enum import Enum
+import hashlib
 import json
 import logging
 import time
-from urllib import request
-from urllib.parse import urljoin
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode, urljoin
+import zlib
 
-import aiohttp
+if TYPE_CHECKING:
+    import decimal
+
+    import aiohttp
 
 # from stokercloud.controller_data import ControllerData
 
@@ -17,19 +24,133 @@ class TokenInvalid(Exception):
     pass
 
 
+class ResponseTooLarge(Exception):
+    pass
+
+
+def _decoder_for(encoding: str | None):
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj(zlib.MAX_WBITS)
+    return None
+
+
+def _feed(decoder, data: bytes, body: bytearray, limit: int):
+    """Decompress `data` into `body`, never growing it past `limit`."""
+    while data:
+        body += decoder.decompress(data, limit - len(body) + 1)
+        if len(body) > limit:
+            raise ResponseTooLarge(f"Response body exceeds {limit} bytes")
+        data = decoder.unconsumed_tail
+
+
 class Client:
     BASE_URL = "http://www.stokercloud.dk/"
-
-    def __init__(self, name: str, password: str = None, cache_time_seconds: int = 10):
+    CONTROLLER_DATA_URL = "v2/dataout2/controllerdata2.php"
+    GRAPH_DATA_URL = "v2/dataout2/getgraphdata.php"
+
+    # Latencies kept for the p95 estimate, and how many are needed before
+    # hedging kicks in.
+    LATENCY_SAMPLES = 100
+    MIN_HEDGE_SAMPLES = 20
+
+    # Responses are read in chunks of CHUNK_SIZE and may not decode to more
+    # than MAX_BODY_SIZE bytes.
+    CHUNK_SIZE = 16 * 1024
+    MAX_BODY_SIZE = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        name: str,
+        password: str = None,
+        cache_time_seconds: int = 10,
+        timeout: float = 30,
+        max_concurrency: int = 2,
+        connect_timeout: float = 10,
+        cycle_budget: float | None = None,
+        hedge: bool = False,
+        session: "aiohttp.ClientSession | None" = None,
+    ):
         self.name = name
         self.password = password
         self.token = None
         self.state = None
         self.last_fetch = None
         self.cache_time_seconds = cache_time_seconds
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.cycle_budget = cycle_budget
+        self.hedge = hedge
+        self.hedged_requests = 0
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.cached_data = None
+        self.fingerprint = None
+        self.skipped_cycles = 0
+        self._flattened = None
+        self._excluded = frozenset()
+        # Transfer statistics: bytes on the wire and after decompression.
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.last_bytes_received = 0
+        self.last_bytes_decoded = 0
+        # A session shared with other clients; it is never closed here.
+        self.session = session
+
+    def configure(
+        self,
+        cache_time_seconds: int | None = None,
+        timeout: float | None = None,
+        max_concurrency: int | None = None,
+        cycle_budget: float | None = None,
+        hedge: bool | None = None,
+    ):
+        """Change caching, timeout and concurrency settings on a live client."""
+        if cache_time_seconds is not None:
+            self.cache_time_seconds = cache_time_seconds
+        if timeout is not None:
+            self.timeout = timeout
+        if max_concurrency is not None:
+            # Requests already waiting keep the old limit; new ones use this one.
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+        if cycle_budget is not None:
+            self.cycle_budget = cycle_budget or None
+        if hedge is not None:
+            self.hedge = hedge
+
+    def _timeout(self):
+        import aiohttp  # loaded on first request, not on import
+
+        # The read deadline applies between chunks, the total one to the
+        # whole request.
+        return aiohttp.ClientTimeout(
+            total=self.timeout,
+            sock_connect=min(self.connect_timeout, self.timeout),
+            sock_read=self.timeout,
+        )
+
+    @asynccontextmanager
+    async def _session(self):
+        if self.session is not None:
+            yield self.session
+            return
+
+        import aiohttp
 
-    async def refresh_token(self):
         async with aiohttp.ClientSession() as session:
+            yield session
+
+    @property
+    def latency_p95(self) -> float | None:
+        """Return the 95th percentile of recent controllerdata2 latencies."""
+        if len(self._latencies) < self.MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    async def refresh_token(self):
+        async with self._semaphore, self._session() as session:
             url = urljoin(
                 self.BASE_URL,
                 "v2/dataout2/login.php?user="
@@ -37,26 +158,121 @@ class Client:
                 + "&password="
                 + self.password,
             )
-            async with session.get(url) as response:
+            async with session.get(url, timeout=self._timeout()) as response:
+                response.raise_for_status()
                 data = await response.json()
                 self.token = data["token"]  # actual token
                 self.state = data["credentials"]  # readonly
 
     async def make_request(self, url, *args, **kwargs):
+        return json.loads(await self.make_raw_request(url, *args, **kwargs))
+
+    async def make_raw_request(self, url, *args, params=None, **kwargs):
+        """Like make_request, but return the undecoded response body."""
         try:
             if self.token is None:
                 raise TokenInvalid()
             absolute_url = urljoin(self.BASE_URL, "%s?token=%s" % (url, self.token))
+            if params:
+                absolute_url += "&" + urlencode(params)
             logger.debug(absolute_url)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(absolute_url) as response:
-                    return await response.json()
+            async with self._semaphore, self._session() as session:
+                async with session.get(
+                    absolute_url,
+                    timeout=self._timeout(),
+                    headers={"Accept-Encoding": "gzip, deflate"},
+                    auto_decompress=False,
+                ) as response:
+                    response.raise_for_status()
+                    return await self._read_body(response)
         except TokenInvalid:
             await self.refresh_token()
-            return await self.make_request(url, *args, **kwargs)
+            return await self.make_raw_request(url, *args, params=params, **kwargs)
+
+    async def _read_body(self, response) -> bytes:
+        """Stream and decompress a response body, bounded by MAX_BODY_SIZE."""
+        decoder = _decoder_for(response.headers.get("Content-Encoding"))
+        limit = self.MAX_BODY_SIZE
+        body = bytearray()
+        received = 0
+
+        async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+            received += len(chunk)
+            if decoder is None:
+                body += chunk
+                if len(body) > limit:
+                    raise ResponseTooLarge(f"Response body exceeds {limit} bytes")
+            else:
+                _feed(decoder, chunk, body, limit)
+        if decoder is not None:
+            body += decoder.flush()
+            if len(body) > limit:
+                raise ResponseTooLarge(f"Response body exceeds {limit} bytes")
+
+        self.last_bytes_received = received
+        self.last_bytes_decoded = len(body)
+        self.bytes_received += received
+        self.bytes_decoded += len(body)
+        return bytes(body)
+
+    async def _timed_request(self, url):
+        start = time.monotonic()
+        body = await self.make_raw_request(url)
+        # Only completed requests are sampled; a cancelled one (hedge loser,
+        # cycle budget) was cut off and would pull the p95 down.
+        self._latencies.append(time.monotonic() - start)
+        return body
+
+    async def _hedged_request(self, url):
+        """Send a second request once the first exceeds p95; first answer wins."""
+        p95 = self.latency_p95
+        if p95 is None:
+            return await self._timed_request(url)
+
+        pending = {asyncio.ensure_future(self._timed_request(url))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=p95)
+            if done:
+                return done.pop().result()
+
+            self.hedged_requests += 1
+            pending.add(asyncio.ensure_future(self._timed_request(url)))
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Both failed; surface the error of the last one.
+            return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def get_controller_data(self):
-        self.cached_data = await self.make_request("v2/dataout2/controllerdata2.php")
+        request = (
+            self._hedged_request(self.CONTROLLER_DATA_URL)
+            if self.hedge
+            else self._timed_request(self.CONTROLLER_DATA_URL)
+        )
+        async with asyncio.timeout(self.cycle_budget):
+            body = await request
+
+        # An identical body means nothing to decode or flatten; the cached
+        # snapshot objects are kept so callers can detect the skip by identity.
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        if fingerprint == self.fingerprint:
+            self.skipped_cycles += 1
+            self.last_fetch = time.time()
+            return
+
+        # Nothing is committed until the body has decoded, so a bad response
+        # can never become the fingerprint later responses are matched against.
+        data = json.loads(body)
+        self.fingerprint = fingerprint
+        self.cached_data = data
+        self._flattened = None
         self.last_fetch = time.time()
 
     async def controller_data(self):
@@ -67,22 +283,38 @@ class Client:
             await self.get_controller_data()
         return ControllerData(self.cached_data)
 
-    async def controller_data_json(self):
-        if (
-            not self.last_fetch
-            or (time.time() - self.last_fetch) > self.cache_time_seconds
-        ):
+    async def controller_data_json(
+        self, max_age: float | None = None, exclude: frozenset = frozenset()
+    ):
+        """Return the flattened snapshot without the keys in `exclude`.
+
+        The same dict is returned until the payload changes; callers must not
+        modify it.
+        """
+        if max_age is None:
+            max_age = self.cache_time_seconds
+        if not self.last_fetch or (time.time() - self.last_fetch) > max_age:
             await self.get_controller_data()
-        return self.flatten_json(self.cached_data)
+        if self._flattened is None or exclude != self._excluded:
+            self._flattened = self.flatten_json(self.cached_data, exclude)
+            self._excluded = exclude
+        return self._flattened
 
     async def update_controller_value(self, menu, name, value):
         urlPart = f"v2/dataout2/updatevalue.php?token={self.token}&menu={menu}&name={name}&value={value}"
         res = await self.make_request(urlPart)
 
-        retval = Value(res["updated_value"], Unit.KILO_GRAM)
+        divisor, unit = WRITE_VALUE_TABLE.get((menu, name), DEFAULT_CONVERSION)
+        retval = Value(res["updated_value"], unit, divisor)
         return retval
 
-    def flatten_json(self, jsonIn):
+    async def graph_data(self, graph: str, day):
+        """Return the samples of one history graph for one day."""
+        return await self.make_request(
+            self.GRAPH_DATA_URL, params={"graph": graph, "date": day.isoformat()}
+        )
+
+    def flatten_json(self, jsonIn, exclude=frozenset()):
         out = {}
 
         def flatten(x, name=""):
@@ -95,7 +327,9 @@ class Client:
                     flatten(a, name + str(i) + "_")
                     i += 1
             else:
-                out[name[:-1]] = x
+                key = name[:-1]
+                if key not in exclude:
+                    out[key] = x
 
         flatten(jsonIn)
         return out
@@ -129,12 +363,67 @@ class State(Enum):
 
 STATE_BY_VALUE = {key.value: key for key in State}
 
+# (submenu, id) -> (divisor, unit) for values read from controllerdata2.php.
+VALUE_TABLE: dict[tuple[str, str], tuple[int, Unit | None]] = {
+    ("frontdata", "boilertemp"): (10, Unit.DEGREE),
+    ("frontdata", "-wantedboilertemp"): (10, Unit.DEGREE),
+    ("frontdata", "dhw"): (10, Unit.DEGREE),
+    ("frontdata", "dhwwanted"): (10, Unit.DEGREE),
+    ("boilerdata", "5"): (10, Unit.KWH),
+    ("hopperdata", "3"): (10, Unit.KILO_GRAM),
+    ("hopperdata", "4"): (10, Unit.KILO_GRAM),
+}
+
+# (menu, name) -> (divisor, unit) for results from updatevalue.php.
+WRITE_VALUE_TABLE: dict[tuple[str, str], tuple[int, Unit | None]] = {
+    ("hopper.content", "hopper.content"): (10, Unit.KILO_GRAM),
+}
+
+DEFAULT_CONVERSION: tuple[int, Unit | None] = (10, None)
+
+VALUE_SUBMENUS = frozenset(submenu for submenu, _id in VALUE_TABLE)
+
+
+def convert_values(data) -> dict:
+    """Convert every known value in a snapshot in a single pass.
+
+    Values that cannot be parsed are left out, so their property returns None.
+    """
+    values = {}
+    for submenu in VALUE_SUBMENUS:
+        items = data.get(submenu)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            conversion = VALUE_TABLE.get((submenu, item.get("id")))
+            if conversion is None:
+                continue
+            try:
+                values[(submenu, item["id"])] = Value(
+                    item["value"], conversion[1], conversion[0]
+                )
+            except (KeyError, TypeError, ValueError):
+                # e.g. "-" from a disconnected probe; only this value is missing.
+                logger.debug("Unparsable %s/%s value", submenu, item["id"])
+    return values
+
 
 class Value:
-    def __init__(self, value, unit):
-        self.value = decimal.Decimal(value) / 10
+    __slots__ = ("raw", "divisor", "value", "unit")
+
+    def __init__(self, value, unit, divisor: int = 10):
+        self.raw = value
+        self.divisor = divisor
+        self.value = float(value) / divisor
         self.unit = unit
 
+    @property
+    def exact(self) -> "decimal.Decimal":
+        """Return the value as an exact Decimal, for when float rounding matters."""
+        import decimal
+
+        return decimal.Decimal(str(self.raw)) / self.divisor
+
     def __eq__(self, other):
         if not isinstance(other, Value):
             # don't attempt to compare against unrelated types
@@ -156,9 +445,10 @@ class ControllerData:
         if data["notconnected"] != 0:
             raise NotConnectedException("Furnace/boiler not connected to StokerCloud")
         self.data = data
+        self.values = convert_values(data)
 
-    def get_sub_item(self, submenu, _id):
-        return get_from_list_by_key(self.data[submenu], "id", _id)
+    def get_value(self, submenu, _id):
+        return self.values.get((submenu, _id))
 
     @property
     def alarm(self):
@@ -178,17 +468,15 @@ class ControllerData:
 
     @property
     def boiler_temperature_current(self):
-        return Value(self.get_sub_item("frontdata", "boilertemp")["value"], Unit.DEGREE)
+        return self.get_value("frontdata", "boilertemp")
 
     @property
     def boiler_temperature_requested(self):
-        return Value(
-            self.get_sub_item("frontdata", "-wantedboilertemp")["value"], Unit.DEGREE
-        )
+        return self.get_value("frontdata", "-wantedboilertemp")
 
     @property
     def boiler_kwh(self):
-        return Value(self.get_sub_item("boilerdata", "5")["value"], Unit.KWH)
+        return self.get_value("boilerdata", "5")
 
     @property
     def state(self):
@@ -196,16 +484,16 @@ class ControllerData:
 
     @property
     def hotwater_temperature_current(self):
-        return Value(self.get_sub_item("frontdata", "dhw")["value"], Unit.DEGREE)
+        return self.get_value("frontdata", "dhw")
 
     @property
     def hotwater_temperature_requested(self):
-        return Value(self.get_sub_item("frontdata", "dhwwanted")["value"], Unit.DEGREE)
+        return self.get_value("frontdata", "dhwwanted")
 
     @property
     def consumption_total(self):
-        return Value(self.get_sub_item("hopperdata", "4")["value"], Unit.KILO_GRAM)
+        return self.get_value("hopperdata", "4")
 
     @property
     def consumption_day(self):
-        return Value(self.get_sub_item("hopperdata", "3")["value"], Unit.KILO_GRAM)
+        return self.get_value("hopperdata", "3")
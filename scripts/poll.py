@@ -0,0 +1,141 @@
+"""Poll many StokerCloud accounts without Home Assistant.
+
+Snapshots are written as NDJSON, one line per account and poll, either to
+stdout or to size-rotated files:
+
+    python scripts/poll.py accounts.json --interval 60
+
+The accounts file is a JSON list of objects with "username" and "password".
+Only the client module is imported, so Home Assistant is not needed; aiohttp
+is.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+import sys
+import time
+
+import aiohttp
+
+# The client module by path; the package __init__ needs Home Assistant.
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "custom_components" / "stokercloud")
+)
+
+from stokercloud_api import Client  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_accounts(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as file:
+        accounts = json.load(file)
+    for account in accounts:
+        if "username" not in account or "password" not in account:
+            raise ValueError("Every account needs a username and a password")
+    return accounts
+
+
+def make_writer(output: str | None, max_bytes: int, backup_count: int):
+    """Return a logger writing one record per line to stdout or a rotating file."""
+    writer = logging.getLogger(f"{__name__}.ndjson")
+    writer.propagate = False
+    writer.setLevel(logging.INFO)
+    if output:
+        handler = RotatingFileHandler(
+            output, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    writer.addHandler(handler)
+    return writer
+
+
+async def poll(client: Client, semaphore: asyncio.Semaphore, keys, writer):
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "account": client.name,
+    }
+    try:
+        async with semaphore:
+            data = await client.controller_data_json()
+        if keys:
+            data = {key: data.get(key) for key in keys}
+        record["data"] = data
+    except Exception as err:  # pylint: disable=broad-except
+        record["error"] = repr(err)
+    writer.info(json.dumps(record, separators=(",", ":")))
+
+
+async def run(args):
+    accounts = load_accounts(args.accounts)
+    keys = [key for key in args.keys.split(",") if key] if args.keys else None
+    writer = make_writer(args.output, args.max_bytes, args.backup_count)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        clients = [
+            Client(
+                account["username"],
+                account["password"],
+                cache_time_seconds=0,
+                timeout=args.timeout,
+                max_concurrency=1,
+                session=session,
+            )
+            for account in accounts
+        ]
+
+        while True:
+            started = time.monotonic()
+            await asyncio.gather(
+                *[poll(client, semaphore, keys, writer) for client in clients]
+            )
+            if args.once:
+                return
+            await asyncio.sleep(max(args.interval - (time.monotonic() - started), 0))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("accounts", help="JSON file with the accounts to poll")
+    parser.add_argument(
+        "--interval", type=float, default=60, help="seconds between polls"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=10, help="maximum requests in flight"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30, help="per-request timeout in seconds"
+    )
+    parser.add_argument(
+        "--keys", help="comma separated flattened keys to keep (default: all)"
+    )
+    parser.add_argument("--output", help="file to write to instead of stdout")
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=50 * 1024 * 1024,
+        help="rotate the output file at this size",
+    )
+    parser.add_argument(
+        "--backup-count", type=int, default=10, help="rotated files to keep"
+    )
+    parser.add_argument("--once", action="store_true", help="poll once and exit")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""Soak test the StokerCloud coordinator and entities at scale.
+
+Runs N simulated entries against a local stand-in for stokercloud.dk. The
+integration reads a simulated clock that jumps straight to the next poll due,
+honouring each coordinator's (burst) update_interval, so hours of polling
+take minutes. The coordinators' own timers are disabled; only the simulated
+schedule polls. Needs Home Assistant and aiohttp installed:
+
+    python scripts/soak.py --entries 50 --hours 6
+
+Prints one JSON report per --report-every simulated minutes with event-loop
+lag, size of coordinator.data and of the Store every entry saves to (fewer
+store_keys than data_keys means entries overwrite each other), listener
+counts (more listeners than entities means duplicates) and state writes.
+--estimate also publishes between-poll estimates on the simulated clock.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import timedelta
+import heapq
+import json
+import logging
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from aiohttp import web
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    frame,
+    restore_state,
+    translation,
+)
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import custom_components.stokercloud as integration_module  # noqa: E402
+from custom_components.stokercloud import (  # noqa: E402
+    HassIntegration,
+    IntegrationCoordinator,
+)
+from custom_components.stokercloud import stokercloud_api  # noqa: E402
+from custom_components.stokercloud.const import (  # noqa: E402
+    DOMAIN,
+    ESTIMATE_INTERVAL,
+)
+from custom_components.stokercloud.binary_sensor import (  # noqa: E402
+    BINARY_SENSORS,
+    IntegrationSensor,
+)
+from custom_components.stokercloud.number import (  # noqa: E402
+    NUMBER_SENSORS,
+    IntegrationNumber,
+)
+from custom_components.stokercloud.sensor import (  # noqa: E402
+    SENSORS_BOILER,
+    StokerCloudSensor,
+)
+from custom_components.stokercloud.stokercloud_api import Client  # noqa: E402
+
+
+POLL, TICK = "poll", "tick"
+
+
+class SimulatedClock:
+    """Stand-in for the `time` module as seen by the integration."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance_to(self, moment: float):
+        self.now = max(self.now, moment)
+
+
+class StandInCloud:
+    """Serve login, controllerdata2 and updatevalue for simulated boilers."""
+
+    def __init__(self, change_every: int, alarm_every: int):
+        self.change_every = change_every
+        self.alarm_every = alarm_every
+        self.requests = Counter()
+        self._polls = Counter()
+
+    def payload(self, user: str) -> dict:
+        poll = self._polls[user]
+        self._polls[user] += 1
+        # The payload only moves every `change_every` polls, like an idle boiler.
+        step = poll // self.change_every
+        rng = random.Random(f"{user}-{step}")
+        alarm = 1 if self.alarm_every and step % self.alarm_every == 0 else 0
+        return {
+            "serial": f"sim-{user}",
+            "notconnected": 0,
+            "miscdata": {
+                "state": {"value": "state_13" if alarm else "state_5"},
+                "output": f"{rng.uniform(0, 20):.1f}",
+                "outputpct": str(rng.randint(0, 100)),
+                "alarm": alarm,
+                "running": 1,
+                "clock": {"value": f"{step % 24:02d}:00"},
+            },
+            "frontdata": [
+                {"id": "hopper", "value": f"{250 - step % 250}", "unit": "kg"},
+                {"id": "boilertemp", "value": f"{rng.uniform(55, 75):.1f}"},
+                {"id": "-wantedboilertemp", "value": "65"},
+                {"id": "dhw", "value": f"{rng.uniform(40, 55):.1f}"},
+                {"id": "dhwwanted", "value": "50"},
+            ],
+            "hopperdata": [
+                {"id": "2", "value": "0"},
+                {"id": "3", "value": f"{step % 30}"},
+                {"id": "4", "value": f"{1000 + step}"},
+            ],
+            "infomessages": ["13" if step % 97 == 0 else "0"],
+            "weatherdata": [
+                {"value": "Simcity"},
+                {"value": f"{rng.uniform(-5, 15):.1f}"},
+                {"value": f"{rng.uniform(0, 10):.1f}"},
+                {"value": "N"},
+            ],
+        }
+
+    async def login(self, request):
+        self.requests["login"] += 1
+        user = request.query["user"]
+        return web.json_response({"token": user, "credentials": "readonly"})
+
+    async def controllerdata(self, request):
+        self.requests["controllerdata2"] += 1
+        return web.json_response(self.payload(request.query["token"]))
+
+    async def updatevalue(self, request):
+        self.requests["updatevalue"] += 1
+        return web.json_response({"updated_value": request.query["value"]})
+
+    async def start(self) -> tuple[web.AppRunner, str]:
+        app = web.Application()
+        app.router.add_get("/v2/dataout2/login.php", self.login)
+        app.router.add_get("/v2/dataout2/controllerdata2.php", self.controllerdata)
+        app.router.add_get("/v2/dataout2/updatevalue.php", self.updatevalue)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}/"
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a short sleeper."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.lags.append(time.monotonic() - start - self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        self._task.cancel()
+
+    def drain(self) -> dict:
+        lags, self.lags = sorted(self.lags), []
+        if not lags:
+            return {"max_ms": 0.0, "p99_ms": 0.0}
+        return {
+            "max_ms": round(lags[-1] * 1000, 2),
+            "p99_ms": round(lags[int(0.99 * (len(lags) - 1))] * 1000, 2),
+        }
+
+
+async def add_entities(hass: HomeAssistant, integration: HassIntegration) -> int:
+    """Add the entities of one entry through an entity platform per domain."""
+    coordinator = integration._coordinator
+    entities = {
+        "sensor": [
+            StokerCloudSensor(coordinator, d, integration) for d in SENSORS_BOILER
+        ],
+        "number": [IntegrationNumber(integration, d) for d in NUMBER_SENSORS],
+        "binary_sensor": [
+            IntegrationSensor(coordinator, d, integration) for d in BINARY_SENSORS
+        ],
+    }
+    for domain, domain_entities in entities.items():
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(f"{__name__}.{domain}"),
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        await platform.async_add_entities(domain_entities)
+    return sum(len(domain_entities) for domain_entities in entities.values())
+
+
+async def run(args):
+    tracemalloc.start()
+    config_dir = tempfile.mkdtemp(prefix="stokercloud-soak-")
+    hass = HomeAssistant(config_dir)
+    frame.async_setup(hass)
+    translation.async_setup(hass)
+    entity.async_setup(hass)
+    await restore_state.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+
+    # Burst decay, the client cache and the estimator all read this clock.
+    clock = SimulatedClock()
+    integration_module.time = clock
+    stokercloud_api.time = clock
+
+    state_writes = Counter()
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        lambda event: state_writes.update([event.data["entity_id"]]),
+    )
+
+    cloud = StandInCloud(args.change_every, args.alarm_every)
+    runner, base_url = await cloud.start()
+
+    coordinators, entity_count = [], 0
+    for index in range(args.entries):
+        alias = f"boiler{index}"
+        client = Client(alias, "secret")
+        client.BASE_URL = base_url
+        coordinator = IntegrationCoordinator(hass, client, alias, args.poll_interval)
+        # Only the simulated schedule below polls.
+        coordinator._schedule_refresh = lambda: None
+        await coordinator.async_load()
+        # Internal values as an installation that already ran would restore.
+        for description in NUMBER_SENSORS:
+            if description.key.startswith("internal"):
+                coordinator.data.setdefault(description.key, description.default_value)
+        await coordinator.async_refresh()
+        if args.estimate:
+            coordinator.async_set_estimation(True)
+            # Estimate ticks follow the simulated schedule as well.
+            coordinator._unsub_estimate()
+            coordinator._unsub_estimate = lambda: None
+        entity_count += await add_entities(hass, HassIntegration(coordinator, alias))
+        coordinators.append(coordinator)
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started_at = clock.now
+    end = started_at + args.hours * 3600
+    report_every = args.report_every * 60
+    next_report = started_at + report_every
+    store_path = Path(hass.config.path(".storage", "stokercloud_data.json"))
+    start_memory = tracemalloc.get_traced_memory()[0]
+    started = time.monotonic()
+    polls = ticks = 0
+
+    # (simulated time due, index of the coordinator, poll or estimate tick)
+    schedule = [
+        (clock.now + c.update_interval.total_seconds(), index, POLL)
+        for index, c in enumerate(coordinators)
+    ]
+    if args.estimate:
+        schedule.extend(
+            (clock.now + ESTIMATE_INTERVAL, index, TICK)
+            for index in range(len(coordinators))
+        )
+    heapq.heapify(schedule)
+
+    while schedule[0][0] <= end:
+        due = schedule[0][0]
+        clock.advance_to(due)
+        batch = []
+        while schedule and schedule[0][0] <= due:
+            batch.append(heapq.heappop(schedule)[1:])
+        for index, kind in batch:
+            if kind == TICK:
+                coordinators[index]._async_estimate_tick()
+                heapq.heappush(schedule, (clock.now + ESTIMATE_INTERVAL, index, TICK))
+        refreshes = [index for index, kind in batch if kind == POLL]
+        await asyncio.gather(*(coordinators[i].async_refresh() for i in refreshes))
+        polls += len(refreshes)
+        ticks += len(batch) - len(refreshes)
+        for index in refreshes:
+            interval = coordinators[index].update_interval.total_seconds()
+            heapq.heappush(schedule, (clock.now + interval, index, POLL))
+
+        if clock.now < next_report and schedule[0][0] <= end:
+            continue
+        next_report += report_every
+
+        # Every entry saves, as each one does on shutdown.
+        for coordinator in coordinators:
+            await coordinator.async_save()
+        data = [coordinator.data for coordinator in coordinators]
+        listeners = sum(len(c._listeners) for c in coordinators)
+        estimate_listeners = sum(
+            len(callbacks)
+            for c in coordinators
+            for callbacks in c._estimate_listeners.values()
+        )
+        skipped = sum(c._api.skipped_cycles for c in coordinators)
+        bursting = sum(c._burst_until is not None for c in coordinators)
+        memory = tracemalloc.get_traced_memory()[0] - start_memory
+        writes = sum(state_writes.values())
+        state_writes.clear()
+        print(
+            json.dumps(
+                {
+                    "simulated_hours": round((clock.now - started_at) / 3600, 2),
+                    "wall_seconds": round(time.monotonic() - started, 1),
+                    "polls": polls,
+                    "loop_lag": monitor.drain(),
+                    "data_keys": sum(len(d) for d in data),
+                    "data_bytes": sum(len(json.dumps(d, default=str)) for d in data),
+                    "store_bytes": (
+                        store_path.stat().st_size if store_path.exists() else 0
+                    ),
+                    # Fewer than data_keys: entries overwrite each other.
+                    "store_keys": (
+                        len(json.loads(store_path.read_text())["data"])
+                        if store_path.exists()
+                        else 0
+                    ),
+                    "listeners": listeners,
+                    "entities": entity_count,
+                    "duplicate_listeners": listeners - entity_count,
+                    "estimate_listeners": estimate_listeners,
+                    "estimate_ticks": ticks,
+                    "state_writes_per_poll": round(writes / max(polls, 1), 2),
+                    "bursting": bursting,
+                    "skipped_cycles": skipped,
+                    "memory_growth_kb": round(memory / 1024, 1),
+                    "cloud_requests": dict(cloud.requests),
+                }
+            ),
+            flush=True,
+        )
+        polls = ticks = 0
+
+    monitor.stop()
+    await runner.cleanup()
+    await hass.async_stop(force=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10, help="simulated entries")
+    parser.add_argument(
+        "--hours", type=float, default=1, help="simulated hours of polling"
+    )
+    parser.add_argument(
+        "--poll-interval", type=int, default=15, help="simulated poll interval (s)"
+    )
+    parser.add_argument(
+        "--change-every", type=int, default=4, help="polls between payload changes"
+    )
+    parser.add_argument(
+        "--alarm-every",
+        type=int,
+        default=50,
+        help="payload changes between alarms (0 disables)",
+    )
+    parser.add_argument(
+        "--report-every", type=float, default=30, help="simulated minutes per report"
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="publish between-poll estimates on the simulated clock",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep the reports readable; per-entity warnings repeat every poll.
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
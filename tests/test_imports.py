@@ -0,0 +1,101 @@
+"""Import-time checks for the StokerCloud integration."""
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+COMPONENT = ROOT / "custom_components" / "stokercloud"
+
+# Budget for importing the client module on its own, in microseconds.
+CLIENT_IMPORT_BUDGET_US = 250_000
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _loaded_after(statement: str, modules: list[str]) -> dict[str, bool]:
+    code = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps({{m: m in sys.modules for m in {modules!r}}}))"
+    )
+    return json.loads(_run(code).stdout)
+
+
+def test_client_module_defers_heavy_imports():
+    """The client loads aiohttp and decimal on first use, not on import."""
+    loaded = _loaded_after(
+        f"sys.path.insert(0, {str(COMPONENT)!r}); import stokercloud_api",
+        ["aiohttp", "decimal", "urllib.request"],
+    )
+    assert loaded == {"aiohttp": False, "decimal": False, "urllib.request": False}
+
+
+def test_descriptions_module_has_no_homeassistant_imports():
+    loaded = _loaded_after(
+        f"sys.path.insert(0, {str(COMPONENT)!r}); import descriptions",
+        ["homeassistant"],
+    )
+    assert loaded == {"homeassistant": False}
+
+
+def test_client_import_time():
+    """Benchmark the client import with -X importtime and keep it in budget."""
+    result = _run(
+        f"import sys; sys.path.insert(0, {str(COMPONENT)!r}); import stokercloud_api",
+        "-X",
+        "importtime",
+    )
+    # Lines look like "import time: self [us] | cumulative | module".
+    cumulative = next(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| stokercloud_api")
+    )
+    assert cumulative < CLIENT_IMPORT_BUDGET_US, (
+        f"stokercloud_api import took {cumulative} us"
+    )
+
+
+def test_integration_import_skips_client_and_other_platforms():
+    """Setup and each platform only load what they need."""
+    pytest.importorskip("homeassistant")
+
+    loaded = _loaded_after(
+        "import custom_components.stokercloud",
+        [
+            "custom_components.stokercloud.stokercloud_api",
+            "custom_components.stokercloud.estimator",
+            "homeassistant.components.number",
+            "homeassistant.components.sensor",
+        ],
+    )
+    assert not any(loaded.values()), loaded
+
+    loaded = _loaded_after(
+        "import custom_components.stokercloud.sensor",
+        [
+            "custom_components.stokercloud.estimator",
+            "custom_components.stokercloud.number",
+            "homeassistant.components.number",
+            "homeassistant.components.binary_sensor",
+        ],
+    )
+    assert not any(loaded.values()), loaded
+
+    loaded = _loaded_after(
+        "import custom_components.stokercloud.number",
+        ["custom_components.stokercloud.estimator"],
+    )
+    assert not any(loaded.values()), loaded